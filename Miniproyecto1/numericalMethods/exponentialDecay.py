@@ -1,36 +1,28 @@
 import numpy as np
 
+# Every scheme below multiplies u by the same amplification factor r at each step,
+# so the whole trajectory is the geometric sequence u0 * r**n. r is a float so that
+# integer inputs give a float64 trajectory instead of silently overflowing int64 powers.
+
 def forward_euler(u0, a, h, T):
     steps = int(T / h)
-    u = np.zeros(steps+1)
-    u[0] = u0
-    for n in range(steps):
-        u[n+1] = (1 - a*h) * u[n]
-    return u
+    r = float(1 - a*h)
+    return u0 * r ** np.arange(steps+1)
 
 def backward_euler(u0, a, h, T):
     steps = int(T / h)
-    u = np.zeros(steps+1)
-    u[0] = u0
-    for n in range(steps):
-        u[n+1] = u[n] / (1 + a*h)
-    return u
+    r = float(1 / (1 + a*h))
+    return u0 * r ** np.arange(steps+1)
 
 def crank_nicolson(u0, a, h, T):
     steps = int(T / h)
-    u = np.zeros(steps+1)
-    u[0] = u0
-    for n in range(steps):
-        u[n+1] = ((1 - 0.5*a*h) / (1 + 0.5*a*h)) * u[n]
-    return u
+    r = float((1 - 0.5*a*h) / (1 + 0.5*a*h))
+    return u0 * r ** np.arange(steps+1)
 
 def theta_rule(u0, a, h, T, theta):
     steps = int(T / h)
-    u = np.zeros(steps+1)
-    u[0] = u0
-    for n in range(steps):
-        u[n+1] = ((1 - (1-theta)*a*h) / (1 + theta*a*h)) * u[n]
-    return u
+    r = float((1 - (1-theta)*a*h) / (1 + theta*a*h))
+    return u0 * r ** np.arange(steps+1)
 
 def exact_solution(u0, a, h, T):
     steps = int(T / h)
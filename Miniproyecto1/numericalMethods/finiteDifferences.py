@@ -1,4 +1,7 @@
-import matplotlib.pyplot as plt
+import numpy as np
+import sympy as sp
+
+from numericalMethods.numbaSupport import njit, is_jitted
 
 # Forward difference: f'(x) ≈ (f(x + h) - f(x)) / h
 def forward_difference(f, var, x, h):
@@ -19,53 +22,172 @@ def weighted_finite_difference(f, var, x, h, theta):
     fwd  = (f.subs(var, x + h) - f.subs(var, x)) / h
     return (1 - theta) * back + theta * fwd
 
-def explicit_euler(f, t0, x0, h, steps):
-    """Forward (explicit) Euler method. Returns list of (t, x) pairs."""
-    t, x = t0, x0
-    result = [(t, x)]
-    for _ in range(steps):
-        x = x + h * f(t, x)
-        t = t + h
-        result.append((t, x))
-    return result
-
-
-def implicit_euler(f, t0, x0, h, steps, iters=20, tol=1e-12):
-    """Backward (implicit) Euler method using fixed-point iteration. Returns list of (t, x) pairs."""
-    t, x = t0, x0
-    result = [(t, x)]
-    for _ in range(steps):
+# Finite differences of samples y[i] = f(x0 + i*h) on a uniform grid, for all nodes at once.
+
+# Forward difference at nodes 0, ..., n-2
+def forward_difference_grid(y, h):
+    y = np.asarray(y, dtype=float)
+    return (y[1:] - y[:-1]) / h
+
+# Backward difference at nodes 1, ..., n-1
+def backward_difference_grid(y, h):
+    y = np.asarray(y, dtype=float)
+    return (y[1:] - y[:-1]) / h
+
+# Central difference at nodes 1, ..., n-2
+def central_difference_grid(y, h):
+    y = np.asarray(y, dtype=float)
+    return (y[2:] - y[:-2]) / (2.0 * h)
+
+# Weighted finite difference at nodes 1, ..., n-2
+def weighted_finite_difference_grid(y, h, theta):
+    y = np.asarray(y, dtype=float)
+    back = (y[1:-1] - y[:-2]) / h
+    fwd  = (y[2:] - y[1:-1]) / h
+    return (1 - theta) * back + theta * fwd
+
+def make_finite_difference(f, var, kind, h, theta=0.5):
+    """
+    Builds a numeric finite-difference operator for the sympy expression f.
+
+    f is lambdified once, so the returned function evaluates the stencil on a whole
+    NumPy array of points in a single broadcast instead of one subs call per point.
+
+    Args:
+        f (sympy.Expr): The function to differentiate.
+        var (sympy.Symbol): The variable of f.
+        kind (str): 'forward', 'backward', 'central' or 'weighted'.
+        h (float): Step size.
+        theta (float): Weight of the forward difference for kind='weighted'.
+
+    Returns:
+        callable: A function xs -> f'(xs) approximated with the chosen stencil.
+    """
+    g = sp.lambdify(var, f, modules=['numpy'])
+    match kind:
+        case 'forward':
+            return lambda xs: (g(xs + h) - g(xs)) / h
+        case 'backward':
+            return lambda xs: (g(xs) - g(xs - h)) / h
+        case 'central':
+            return lambda xs: (g(xs + h) - g(xs - h)) / (2 * h)
+        case 'weighted':
+            return lambda xs: ((1 - theta) * (g(xs) - g(xs - h)) + theta * (g(xs + h) - g(xs))) / h
+        case _:
+            raise ValueError("Invalid finite difference kind. Must be 'forward', 'backward', 'central' or 'weighted'.")
+
+# ODE stepper kernels. They are compiled with numba when it is installed; in that
+# case f must itself be an @njit function to run compiled (see _run).
+
+@njit(cache=True)
+def _explicit_euler(f, t0, x0, h, steps):
+    ts = np.empty(steps + 1)
+    xs = np.empty(steps + 1)
+    ts[0], xs[0] = t0, x0
+    for n in range(steps):
+        xs[n + 1] = xs[n] + h * f(ts[n], xs[n])
+        ts[n + 1] = ts[n] + h
+    return ts, xs
+
+
+@njit(cache=True)
+def _implicit_euler(f, jac, t0, x0, h, steps, iters, tol):
+    ts = np.empty(steps + 1)
+    xs = np.empty(steps + 1)
+    ts[0], xs[0] = t0, x0
+    for n in range(steps):
+        t_next = ts[n] + h
+        y = xs[n]  # initial guess
+        y_new = y
+        for _ in range(iters):
+            if jac is None:
+                y_new = xs[n] + h * f(t_next, y)   # implicit: f at (t+h, y)
+                if abs(y_new - y) < tol:
+                    break
+            else:
+                # Newton step on g(y) = y - x - h*f(t+h, y)
+                g = y - xs[n] - h * f(t_next, y)
+                if abs(g) < tol:
+                    break
+                y_new = y - g / (1 - h * jac(t_next, y))
+            y = y_new
+        ts[n + 1], xs[n + 1] = t_next, y_new
+    return ts, xs
+
+
+@njit(cache=True)
+def _theta_method(f, jac, t0, x0, h, steps, theta, iters, tol):
+    ts = np.empty(steps + 1)
+    xs = np.empty(steps + 1)
+    ts[0], xs[0] = t0, x0
+    for n in range(steps):
+        t, x = ts[n], xs[n]
         t_next = t + h
-        y = x  # initial guess
+        explicit_part = x + h * (1 - theta) * f(t, x)
+        y = x
+        y_new = y
         for _ in range(iters):
-            y_new = x + h * f(t_next, y)   # implicit: f at (t+h, y)
-            if abs(y_new - y) < tol:
-                break
+            if jac is None:
+                y_new = explicit_part + h * theta * f(t_next, y)
+                if abs(y_new - y) < tol:
+                    break
+            else:
+                # Newton step on g(y) = y - x - h*((1 - θ)*f(t, x) + θ*f(t+h, y))
+                g = y - explicit_part - h * theta * f(t_next, y)
+                if abs(g) < tol:
+                    break
+                y_new = y - g / (1 - h * theta * jac(t_next, y))
             y = y_new
-        x, t = y_new, t_next
-        result.append((t, x))
-    return result
+        ts[n + 1], xs[n + 1] = t_next, y_new
+    return ts, xs
 
 
-def theta_method(f, t0, x0, h, steps, theta=0.5):
+def _rhs_and_jacobian(f, jac):
+    """
+    Converts a sympy right-hand side f(t, x) (in the symbols 't' and 'x') to a numeric function
+    and, when no jac is given, derives its Jacobian ∂f/∂x symbolically.
+    """
+    if isinstance(f, sp.Expr):
+        t, x = sp.symbols('t x')
+        if jac is None:
+            jac = sp.lambdify((t, x), sp.diff(f, x), modules=['numpy'])
+        f = sp.lambdify((t, x), f, modules=['numpy'])
+    return f, jac
+
+
+def _run(kernel, *args):
+    """Runs the compiled kernel when every function argument is a numba function, otherwise its pure Python version."""
+    if all(is_jitted(arg) for arg in args if callable(arg)):
+        return kernel(*args)
+    return getattr(kernel, 'py_func', kernel)(*args)
+
+
+def explicit_euler(f, t0, x0, h, steps):
+    """Forward (explicit) Euler method. Returns arrays (ts, xs)."""
+    return _run(_explicit_euler, f, t0, x0, h, steps)
+
+
+def implicit_euler(f, t0, x0, h, steps, iters=20, tol=1e-12, jac=None):
+    """
+    Backward (implicit) Euler method. Returns arrays (ts, xs).
+
+    Each step is solved with Newton's method when the Jacobian ∂f/∂x is known, either passed
+    as jac(t, x) or derived from f given as a sympy expression in 't' and 'x'. Otherwise
+    fixed-point iteration is used.
+    """
+    f, jac = _rhs_and_jacobian(f, jac)
+    return _run(_implicit_euler, f, jac, t0, x0, h, steps, iters, tol)
+
+
+def theta_method(f, t0, x0, h, steps, theta=0.5, iters=20, tol=1e-12, jac=None):
     """
     General θ-method:
       theta = 0   -> forward Euler
       theta = 1   -> backward Euler
       theta = 0.5 -> Crank-Nicolson (trapezoidal rule)
-    Returns a list of (t, x) pairs.
+    The implicit equation of each step is solved as in implicit_euler (Newton's method
+    when a Jacobian is available, fixed-point iteration otherwise).
+    Returns arrays (ts, xs).
     """
-    t, x = t0, x0
-    result = [(t, x)]
-    for _ in range(steps):
-        t_next = t + h
-        y = x
-        for _ in range(20):
-            y_new = x + h * ((1 - theta) * f(t, x) + theta * f(t_next, y))
-            if abs(y_new - y) < 1e-12:
-                break
-            y = y_new
-        x_new = y_new
-    x, t = x_new, t_next
-    result.append((t, x))
-    return result
+    f, jac = _rhs_and_jacobian(f, jac)
+    return _run(_theta_method, f, jac, t0, x0, h, steps, theta, iters, tol)
@@ -1,6 +1,72 @@
+from functools import lru_cache
+
 import sympy as sp
-import matplotlib.pyplot as plt
 import numpy as np
+from numpy.polynomial.legendre import leggauss
+
+from numericalMethods.interpolation import cached_lambdify, piecewise_lagrange_interpolation
+
+# Gauss-Legendre nodes and weights on [-1, 1] as float64 arrays, computed once at import
+_GAUSS_LEGENDRE = {n: leggauss(n) for n in range(1, 11)}
+
+# The integration variable of the sympy integrands
+_X = sp.Symbol('x')
+
+def _numeric_function(expr):
+    """Returns the numeric function of an integrand given as a sympy expression or a callable."""
+    return cached_lambdify(expr) if isinstance(expr, sp.Basic) else expr
+
+def _evaluate(expr, nodes):
+    """
+    Evaluates the integrand on an array of nodes with a single vectorized call.
+
+    The integrand is either a sympy expression in 'x', converted with cached_lambdify so no
+    symbolic substitution is performed per point, or a numeric function that already accepts
+    NumPy arrays. Constant integrands (which lambdify returns as a scalar) are broadcast to
+    the shape of the nodes.
+    """
+    f = _numeric_function(expr)
+    return np.broadcast_to(np.asarray(f(nodes), dtype=float), nodes.shape)
+
+def _exact_polynomial_integral(expr, lower_bound, upper_bound, degree):
+    """
+    Returns the closed-form integral of expr over [lower_bound, upper_bound] as a float when expr
+    is a sympy polynomial in 'x' of degree at most 'degree', and None otherwise.
+    """
+    if not isinstance(expr, sp.Basic) or not expr.free_symbols <= {_X} or not expr.is_polynomial(_X):
+        return None
+    if sp.degree(expr, _X) > degree:
+        return None
+    return float(sp.integrate(expr, (_X, lower_bound, upper_bound)))
+
+# Weight vectors of the composite rules, built once per number of subintervals n.
+# They are shared between calls, so they are returned read-only.
+
+@lru_cache(maxsize=32)
+def _trapezoidal_weights(n):
+    # [1, 2, 2, ..., 2, 1]
+    w = np.full(n + 1, 2.0)
+    w[0] = w[-1] = 1
+    w.flags.writeable = False
+    return w
+
+@lru_cache(maxsize=32)
+def _simpson_weights(n):
+    # [1, 4, 2, 4, ..., 2, 4, 1]
+    w = np.ones(n + 1)
+    w[1:-1:2] = 4
+    w[2:-1:2] = 2
+    w.flags.writeable = False
+    return w
+
+@lru_cache(maxsize=32)
+def _simpson_38_weights(n):
+    # [1, 3, 3, 2, 3, 3, 2, ..., 3, 3, 1]
+    w = np.full(n + 1, 3.0)
+    w[3:-1:3] = 2
+    w[0] = w[-1] = 1
+    w.flags.writeable = False
+    return w
 
 def midpoint_rule(expr, lower_bound, upper_bound, n):
     """
@@ -15,7 +81,8 @@ def midpoint_rule(expr, lower_bound, upper_bound, n):
         where Δx = (b - a) / n
 
     Parameters:
-        expr (sympy expression): The mathematical expression to integrate, as a sympy symbolic expression in 'x'.
+        expr (sympy expression or callable): The mathematical expression to integrate, as a sympy symbolic expression in 'x',
+            or a numeric function evaluated on NumPy arrays.
         lower_bound (float): The lower limit of integration.
         upper_bound (float): The upper limit of integration.
         n (int): The number of subintervals to use in the approximation.
@@ -23,13 +90,15 @@ def midpoint_rule(expr, lower_bound, upper_bound, n):
     Returns:
         float: The approximate value of the definite integral over [lower_bound, upper_bound].
     """
-    x = sp.symbols('x')
+    # Polynomials of degree <= 1 are integrated exactly by this rule: use the closed form
+    exact = _exact_polynomial_integral(expr, lower_bound, upper_bound, 1)
+    if exact is not None:
+        return exact
+
+    lower_bound, upper_bound = float(lower_bound), float(upper_bound)
     dx = (upper_bound - lower_bound) / n
-    total = 0
-    for i in range(n):
-        mid_point = lower_bound + (i + 0.5) * dx
-        total += expr.subs(x, mid_point) * dx
-    return total
+    mid_points = lower_bound + (np.arange(n) + 0.5) * dx
+    return float(dx * _evaluate(expr, mid_points).sum())
 
 def trapezoidal_rule(expr, lower_bound, upper_bound, n):
     """
@@ -47,7 +116,8 @@ def trapezoidal_rule(expr, lower_bound, upper_bound, n):
             Δx = (b - a) / n
 
     Args:
-        expr (sympy.Expr): The symbolic expression to integrate, as a function of x.
+        expr (sympy.Expr or callable): The symbolic expression to integrate, as a function of x,
+            or a numeric function evaluated on NumPy arrays.
         lower_bound (float): The lower limit of integration (a).
         upper_bound (float): The upper limit of integration (b).
         n (int): The number of subintervals (trapezoids) to use.
@@ -55,12 +125,15 @@ def trapezoidal_rule(expr, lower_bound, upper_bound, n):
     Returns:
         float: The approximate value of the definite integral over [lower_bound, upper_bound].
     """
-    x = sp.symbols('x')
+    # Polynomials of degree <= 1 are integrated exactly by this rule: use the closed form
+    exact = _exact_polynomial_integral(expr, lower_bound, upper_bound, 1)
+    if exact is not None:
+        return exact
+
+    lower_bound, upper_bound = float(lower_bound), float(upper_bound)
     dx = (upper_bound - lower_bound) / n
-    total = 0
-    for i in range(n):
-        total += (expr.subs(x, lower_bound + i * dx) + expr.subs(x, lower_bound + (i + 1) * dx)) * dx / 2
-    return total
+    nodes = np.linspace(lower_bound, upper_bound, n + 1)
+    return float(dx / 2 * np.dot(_trapezoidal_weights(n), _evaluate(expr, nodes)))
 
 def simpson_rule(expr, lower_bound, upper_bound, n):
     """
@@ -71,7 +144,8 @@ def simpson_rule(expr, lower_bound, upper_bound, n):
     where dx = (b - a) / n, and n is an even integer.
 
     Parameters:
-        expr (sympy.Expr): The symbolic expression to integrate, as a function of x.
+        expr (sympy.Expr or callable): The symbolic expression to integrate, as a function of x,
+            or a numeric function evaluated on NumPy arrays.
         lower_bound (float): The lower limit of integration (a).
         upper_bound (float): The upper limit of integration (b).
         n (int): The number of subintervals (must be even; will be incremented if odd).
@@ -83,16 +157,17 @@ def simpson_rule(expr, lower_bound, upper_bound, n):
         - If n is odd, it will be incremented by 1 to ensure an even number of intervals.
         - The function evaluates the expression at equally spaced points between the bounds.
     """
-    x = sp.symbols('x')
     if n % 2 == 1:
         n += 1  # Simpson's rule requires an even number of intervals
+    # Polynomials of degree <= 3 are integrated exactly by this rule: use the closed form
+    exact = _exact_polynomial_integral(expr, lower_bound, upper_bound, 3)
+    if exact is not None:
+        return exact
+
+    lower_bound, upper_bound = float(lower_bound), float(upper_bound)
     dx = (upper_bound - lower_bound) / n
-    total = expr.subs(x, lower_bound) + expr.subs(x, upper_bound)
-    for i in range(1, n, 2):
-        total += 4 * expr.subs(x, lower_bound + i * dx)
-    for i in range(2, n-1, 2):
-        total += 2 * expr.subs(x, lower_bound + i * dx)
-    return total * dx / 3
+    nodes = np.linspace(lower_bound, upper_bound, n + 1)
+    return float(dx / 3 * np.dot(_simpson_weights(n), _evaluate(expr, nodes)))
 
 def simpson_38_rule(expr, lower_bound, upper_bound, n):
     """
@@ -103,7 +178,8 @@ def simpson_38_rule(expr, lower_bound, upper_bound, n):
     where h = (b - a) / n, and n is a multiple of 3.
 
     Parameters:
-        expr (sympy.Expr): The symbolic expression to integrate, as a function of x.
+        expr (sympy.Expr or callable): The symbolic expression to integrate, as a function of x,
+            or a numeric function evaluated on NumPy arrays.
         lower_bound (float): The lower limit of integration (a).
         upper_bound (float): The upper limit of integration (b).
         n (int): The number of subintervals (must be a multiple of 3; will be incremented if not).
@@ -111,21 +187,18 @@ def simpson_38_rule(expr, lower_bound, upper_bound, n):
     Returns:
         float: The approximate value of the definite integral over [lower_bound, upper_bound].
     """
-    x = sp.symbols('x')
     if n % 3 != 0:
         n += 3 - (n % 3)  # Ensure n is a multiple of 3
-    h = (upper_bound - lower_bound) / n
-
-    total = expr.subs(x, lower_bound) + expr.subs(x, upper_bound)
+    # Polynomials of degree <= 3 are integrated exactly by this rule: use the closed form
+    exact = _exact_polynomial_integral(expr, lower_bound, upper_bound, 3)
+    if exact is not None:
+        return exact
 
-    for i in range(1, n):
-        xi = lower_bound + i * h
-        if i % 3 == 0:
-            total += 2 * expr.subs(x, xi)
-        else:
-            total += 3 * expr.subs(x, xi)
+    lower_bound, upper_bound = float(lower_bound), float(upper_bound)
+    h = (upper_bound - lower_bound) / n
+    nodes = np.linspace(lower_bound, upper_bound, n + 1)
 
-    return total * 3 * h / 8
+    return float(3 * h / 8 * np.dot(_simpson_38_weights(n), _evaluate(expr, nodes)))
 
 def gauss_legendre(expr, lower_bound, upper_bound, n):
     """
@@ -133,36 +206,68 @@ def gauss_legendre(expr, lower_bound, upper_bound, n):
     using Gauss-Legendre quadrature.
 
     Args:
-        expr (sympy.Expr): The symbolic expression to integrate, as a function of x.
-        n (int): The number of quadrature points to use (must be 1, 2, or 3).
+        expr (sympy.Expr or callable): The symbolic expression to integrate, as a function of x,
+            or a numeric function evaluated on NumPy arrays.
+        n (int): The number of quadrature points to use (from 1 to 10).
 
     Returns:
         float: The approximate value of the definite integral over [-1, 1].
     """
-    x = sp.symbols('x')
+    if n not in _GAUSS_LEGENDRE:
+        raise ValueError("Invalid number of quadrature points. Must be between 1 and 10.")
 
-    nodes = {
-        1: [0], 
-        2: [-sp.sqrt(3)/3, sp.sqrt(3)/3], 
-        3: [-sp.sqrt(3/5), 0, sp.sqrt(3/5)], 
-        4: [-sp.sqrt(3/7 - 2/7 * sp.sqrt(6/5)), sp.sqrt(3/7 - 2/7 * sp.sqrt(6/5)), -sp.sqrt(3/7 + 2/7 * sp.sqrt(6/5)), sp.sqrt(3/7 + 2/7 * sp.sqrt(6/5))], 
-        5: [-1/3 * sp.sqrt(5 - 2 * sp.sqrt(10/7)), -1/3 * sp.sqrt(5 + 2 * sp.sqrt(10/7)), 0, 1/3 * sp.sqrt(5 - 2 * sp.sqrt(10/7)), 1/3 * sp.sqrt(5 + 2 * sp.sqrt(10/7))]
-    }
-
-    weights = {
-        1: [2],
-        2: [1, 1],
-        3: [5/9, 8/9, 5/9],
-        4: [(18 + sp.sqrt(30))/36, (18 + sp.sqrt(30))/36, (18 - sp.sqrt(30))/36, (18 - sp.sqrt(30))/36],
-        5: [(322 + 13*sp.sqrt(70))/900, (322 + 13*sp.sqrt(70))/900, 128/225, (322 - 13*sp.sqrt(70))/900, (322 - 13*sp.sqrt(70))/900]
-    }
-
-    if n not in nodes or n not in weights:
-        raise ValueError("Invalid number of quadrature points. Must be 1, 2, 3, 4, or 5.")
-    
-    total = sum(weights[n][i] * expr.subs(x, (upper_bound - lower_bound) / 2 * nodes[n][i] + (upper_bound + lower_bound) / 2) for i in range(n))
+    nodes, weights = _GAUSS_LEGENDRE[n]
+    # Polynomials of degree <= 2 * n - 1 are integrated exactly by this rule: use the closed form
+    exact = _exact_polynomial_integral(expr, lower_bound, upper_bound, 2 * n - 1)
+    if exact is not None:
+        return exact
+
+    lower_bound, upper_bound = float(lower_bound), float(upper_bound)
+    mapped_nodes = (upper_bound - lower_bound) / 2 * nodes + (upper_bound + lower_bound) / 2
+    total = weights @ _evaluate(expr, mapped_nodes)
 
-    return total * (upper_bound - lower_bound) / 2
+    return float(total * (upper_bound - lower_bound) / 2)
+
+def adaptive_simpson(expr, lower_bound, upper_bound, tol=1e-10, max_depth=20):
+    """
+    Approximates the definite integral of a given expression using adaptive Simpson's Rule.
+
+    Simpson's Rule S(a, b) is compared with S(a, c) + S(c, b), where c is the midpoint.
+    If the difference is below 15 * tol the refined value (with Richardson correction) is
+    accepted; otherwise each half is integrated recursively with tol / 2. Subintervals are
+    only refined where the integrand needs it, so peaky integrands require far fewer
+    evaluations than a uniform grid of the same accuracy.
+
+    Args:
+        expr (sympy.Expr or callable): The symbolic expression to integrate, as a function of x,
+            or a numeric function of a float.
+        lower_bound (float): The lower limit of integration (a).
+        upper_bound (float): The upper limit of integration (b).
+        tol (float): The absolute error tolerance.
+        max_depth (int): The maximum number of recursive halvings.
+
+    Returns:
+        float: The approximate value of the definite integral over [lower_bound, upper_bound].
+    """
+    f = _numeric_function(expr)
+
+    def simpson(a, b, fa, fm, fb):
+        return (b - a) / 6 * (fa + 4 * fm + fb)
+
+    def refine(a, b, fa, fm, fb, whole, tol, depth):
+        c = (a + b) / 2
+        fl = float(f((a + c) / 2))
+        fr = float(f((c + b) / 2))
+        left = simpson(a, c, fa, fl, fm)
+        right = simpson(c, b, fm, fr, fb)
+        if depth == 0 or abs(left + right - whole) < 15 * tol:
+            return left + right + (left + right - whole) / 15
+        return (refine(a, c, fa, fl, fm, left, tol / 2, depth - 1)
+                + refine(c, b, fm, fr, fb, right, tol / 2, depth - 1))
+
+    a, b = float(lower_bound), float(upper_bound)
+    fa, fm, fb = float(f(a)), float(f((a + b) / 2)), float(f(b))
+    return refine(a, b, fa, fm, fb, simpson(a, b, fa, fm, fb), tol, max_depth)
 
 def revolution_solid_volume(expr, lower_bound, upper_bound, integration_method, n):
     """
@@ -170,7 +275,8 @@ def revolution_solid_volume(expr, lower_bound, upper_bound, integration_method,
     symbolic expression around the x-axis using numerical integration.
 
     Args:
-        expr (sympy.Expr): The symbolic expression to rotate, as a function of x.
+        expr (sympy.Expr or callable): The symbolic expression to rotate, as a function of x,
+            or a numeric function evaluated on NumPy arrays.
         lower_bound (float): The lower limit of integration (a).
         upper_bound (float): The upper limit of integration (b).
         n (int): The number of subintervals to use for integration.
@@ -179,39 +285,69 @@ def revolution_solid_volume(expr, lower_bound, upper_bound, integration_method,
         float: The approximate volume of the solid of revolution.
     """
     # Volume of revolution formula: V = π * ∫[a, b] (f(x))^2 dx
-    volume_expr = sp.pi * expr**2  # symbolic square works
-    return integration_method(volume_expr, lower_bound, upper_bound, n).evalf()
+    f = _numeric_function(expr)
+    return integration_method(lambda xs: np.pi * f(xs)**2, lower_bound, upper_bound, n)
+
+def piecewise_revolution_volume(points, pts_per_interval=3):
+    """
+    Computes in closed form the volume of the solid of revolution generated by rotating around
+    the x-axis the piecewise Lagrange interpolant of the given points.
+
+    The interpolant is built with interpolation.piecewise_lagrange_interpolation, whose pieces
+    are polynomials p in the local variable t = x - breaks[i]. For each piece p² comes from
+    np.convolve of its coefficients and π ∫ p² dt over [0, breaks[i+1] - breaks[i]] from the
+    coefficients of its antiderivative, so no sympy integration is needed. Working in t keeps
+    the antiderivative well conditioned when the points are far from the origin.
+
+    Args:
+        points: A list of tuples (x, y) or an array of shape (n, 2) with the data points, sorted by x.
+        pts_per_interval (int): The number of points in each subinterval.
+
+    Returns:
+        float: The volume of the solid of revolution.
+    """
+    piecewise = piecewise_lagrange_interpolation(points, pts_per_interval)
+    volume = 0.0
+
+    for coefs, length in zip(piecewise.coeffs, np.diff(piecewise.breaks)):
+        antiderivative = np.polyint(np.convolve(coefs, coefs))
+        volume += np.pi * np.polyval(antiderivative, length)  # the antiderivative is 0 at t = 0
+
+    return float(volume)
 
 def graph_revolution_solid(expr, lower_bound, upper_bound, num_x=100, num_theta=50):
     """
     Graphs the solid of revolution for y = f(x) rotated around the x-axis.
     
     Args:
-        expr (sympy.Expr): The function y = f(x) as a sympy expression.
+        expr (sympy.Expr or callable): The function y = f(x) as a sympy expression,
+            or a numeric function evaluated on NumPy arrays.
         lower_bound (float): Lower limit for x.
         upper_bound (float): Upper limit for x.
         num_x (int): Number of sample points along x-axis.
         num_theta (int): Number of angular divisions for revolution.
     """
-    x = sp.symbols('x')
+    import matplotlib.pyplot as plt  # imported here so the numeric routines don't pay for matplotlib
+
     lower_bound = float(lower_bound)
     upper_bound = float(upper_bound)
 
 
     # Convert symbolic expression to a numerical function
-    f = sp.lambdify(x, expr, modules=['numpy'])
+    f = _numeric_function(expr)
 
-    # Create meshgrid for revolution
+    # Sample the radius along x (row vector) and the angle (column vector)
     x_vals = np.linspace(lower_bound, upper_bound, num_x)
-    y_vals = f(x_vals)
+    y_vals = np.broadcast_to(f(x_vals), x_vals.shape)  # radius at each x
 
     theta = np.linspace(0, 2*np.pi, num_theta)
-    X, Theta = np.meshgrid(x_vals, theta)
-    R = np.tile(y_vals, (num_theta, 1))  # radius at each x
+    R = y_vals[None, :]
 
-    # Convert to Cartesian coordinates for surface
-    Y = R * np.cos(Theta)
-    Z = R * np.sin(Theta)
+    # Convert to Cartesian coordinates for surface; broadcasting builds the
+    # (num_theta, num_x) mesh without tiling the radius or the x values
+    X = np.broadcast_to(x_vals[None, :], (num_theta, num_x))
+    Y = R * np.cos(theta)[:, None]
+    Z = R * np.sin(theta)[:, None]
 
     # Plot
     fig = plt.figure(figsize=(8,6))
@@ -251,6 +387,10 @@ def test_integration_methods(expr, a, b, n):
     result_gauss_legendre = gauss_legendre(expr, a, b, 3)
     print(f"Test Function - Gauss-Legendre Result: {sp.N(result_gauss_legendre)}")
 
+    # Adaptive Simpson's Rule
+    result_adaptive_simpson = adaptive_simpson(expr, a, b)
+    print(f"Test Function - Adaptive Simpson's Result: {sp.N(result_adaptive_simpson)}")
+
 # Run tests
 if __name__ == "__main__":
     x = sp.symbols('x')
@@ -264,6 +404,7 @@ if __name__ == "__main__":
     # Simpson 1/3:  2.00000001082450
     # Simpson 3/8:  2.00000002250282
     # Gauss-Leg.:   2.00138891360774
+    # Adaptive S.:  2.00000000000000
 
     # ∫₀^π sin²(x) dx
     print("Function:", sp.sin(x)**2)
@@ -274,6 +415,7 @@ if __name__ == "__main__":
     # Simpson 1/3:  1.57079632679490
     # Simpson 3/8:  1.57079632679490
     # Gauss-Leg.:   1.60606730241802
+    # Adaptive S.:  1.57079632679490
 
     # ∫₋₁^1 (x³ + 5) dx
     print("Function:", x**3 + 5)
@@ -284,6 +426,7 @@ if __name__ == "__main__":
     # Simpson 1/3:  10.0000000000000
     # Simpson 3/8:  10.0000000000000
     # Gauss-Leg.:   10.0000000000000
+    # Adaptive S.:  10.0000000000000
 
     # ∫₁₀²⁰ x³ dx
     print("Function:", x**3)
@@ -294,6 +437,7 @@ if __name__ == "__main__":
     # Simpson 1/3:  37500.0000000000
     # Simpson 3/8:  37500.0000000000
     # Gauss-Leg.:   37500.0000000000
+    # Adaptive S.:  37500.0000000000
 
     # Test Volume of Solid of Revolution
 
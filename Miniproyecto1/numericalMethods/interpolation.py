@@ -1,70 +1,382 @@
+from functools import lru_cache
+
 import sympy as sp
-import matplotlib.pyplot as plt
 import numpy as np
+from numpy.polynomial import Polynomial
+from numpy.lib.stride_tricks import sliding_window_view
+
+from numericalMethods.numbaSupport import njit, prange
+
+# The variable of every expression built or lambdified here
+_X = sp.Symbol('x')
+
+@lru_cache(maxsize=128)
+def cached_lambdify(expr, use_numba=False):
+    """
+    Convert a sympy expression in 'x' to a NumPy function, with common subexpressions eliminated.
+
+    The result is cached per expression because lambdify generates and compiles code on every
+    call, which dominates when the same interpolant is plotted or integrated again. This is the
+    one conversion used by interpolation, integration and the plotting utilities. With use_numba=True
+    (requires numba) the function is compiled into a parallel float64 ufunc.
+    A Piecewise over contiguous intervals is evaluated with lambdify_piecewise.
+    """
+    if isinstance(expr, sp.Piecewise):
+        f = lambdify_piecewise(expr, use_numba)
+        if f is not None:
+            return f
+    f = sp.lambdify(_X, expr, modules=['numpy'], cse=True)
+    if use_numba:
+        from numba import vectorize, float64
+        f = vectorize([float64(float64)], target='parallel')(f)
+    return f
+
+def _interval_bounds(cond):
+    """
+    Return the bounds (a, b) of a condition a <= x <= b in 'x', or None for other conditions.
 
-def lagrange_interpolation(points):
+    And(x >= a, x <= b), the shape built by PiecewiseLagrange.as_sympy, is read directly from
+    its two relationals; other conditions fall back to sympy's set solver, which is much slower.
     """
-    Perform Lagrange interpolation for three points.
-        Args: 
-            p0, p1, p2: tuples of the form (x, y) where x is the x-coordinate and y is the y-coordinate.
+    if isinstance(cond, sp.And) and len(cond.args) == 2:
+        lower = upper = None
+        for rel in cond.args:
+            if not isinstance(rel, (sp.GreaterThan, sp.LessThan)):
+                break
+            if rel.lhs == _X and rel.rhs.is_number:
+                bound, is_lower = float(rel.rhs), isinstance(rel, sp.GreaterThan)
+            elif rel.rhs == _X and rel.lhs.is_number:
+                bound, is_lower = float(rel.lhs), isinstance(rel, sp.LessThan)
+            else:
+                break
+            if is_lower:
+                lower = bound
+            else:
+                upper = bound
+        else:
+            if lower is not None and upper is not None:
+                return lower, upper
+    interval = cond.as_set()
+    if isinstance(interval, sp.Interval) and not (interval.left_open or interval.right_open):
+        return float(interval.start), float(interval.end)
+    return None
+
+def lambdify_piecewise(expr, use_numba=False):
+    """
+    Convert a sympy Piecewise in 'x' whose conditions are contiguous intervals a <= x <= b
+    (as built by PiecewiseLagrange.as_sympy) to a NumPy function.
+
+    lambdify turns a Piecewise into numpy.select, which evaluates every piece on every point.
+    Here each point is assigned its interval with np.searchsorted, and each piece is evaluated
+    only on its own points. Points outside all the intervals give nan, as with numpy.select.
+
+        Args:
+            expr: the sympy Piecewise expression.
+            use_numba: If True, compile each piece with numba (see cached_lambdify).
         Returns:
-            A sympy expression representing the Lagrange polynomial.
+            The numeric function, or None if the conditions are not contiguous intervals.
     """
+    breaks = []
+    funcs = []
+    for piece, cond in expr.args:
+        bounds = _interval_bounds(cond)
+        if bounds is None or (breaks and bounds[0] != breaks[-1]):
+            return None
+        if not breaks:
+            breaks.append(bounds[0])
+        breaks.append(bounds[1])
+        funcs.append(cached_lambdify(piece, use_numba))
+    breaks = np.array(breaks)
 
-    x = sp.symbols('x')
+    def f(x):
+        xq = np.atleast_1d(np.asarray(x, dtype=float))
+        out = np.full(xq.shape, np.nan)
+        # A break shared by two intervals belongs to the first one, as in sympy's Piecewise
+        idx = np.searchsorted(breaks, xq, side='left') - 1
+        idx[xq == breaks[0]] = 0
+        for i, g in enumerate(funcs):
+            mask = idx == i
+            if mask.any():
+                out[mask] = g(xq[mask])
+        return out.reshape(np.shape(x))
+    return f
+
+def _as_xy(points):
+    """
+    Split the points, a list of (x, y) tuples or an array of shape (n, 2), into two
+    C-contiguous float64 arrays xs and ys.
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    return np.ascontiguousarray(pts[:, 0]), np.ascontiguousarray(pts[:, 1])
 
-    poly = 0
+def lagrange_interpolation(points, to_sympy=False, form='poly'):
+    """
+    Perform Lagrange interpolation through the given points.
+
+    The interpolating polynomial is built in float64 from Newton's divided differences,
+    f[x0] + f[x0,x1](x - x0) + ... + f[x0,...,xk](x - x0)...(x - x_{k-1}),
+    and expanded to monomial coefficients with Horner's scheme on the Newton basis.
+
+        Args:
+            points: list of tuples of the form (x, y) where x is the x-coordinate and y is the y-coordinate,
+                or an array of shape (n, 2).
+            to_sympy: If True, return the polynomial as a sympy expression in 'x'.
+            form: Shape of the sympy expression: 'poly' for the expanded monomial sum, 'horner'
+                for its nested Horner form (cheaper to evaluate after lambdify) or 'raw' for the
+                unexpanded Newton form. Only used when to_sympy is True.
+        Returns:
+            A numpy.polynomial.Polynomial (or a sympy expression if to_sympy is True)
+            representing the Lagrange polynomial.
+    """
+    if form not in ('raw', 'poly', 'horner'):
+        raise ValueError(f"Unknown form '{form}'. Use 'raw', 'poly' or 'horner'.")
 
-    for i, (xi, yi) in enumerate(points):
-        term = yi
-        for j, (xj, _) in enumerate(points):
-            if i != j:
-                term *= (x - xj) / (xi - xj)
-        poly += term
+    xs, ys = _as_xy(points)
+    coefs = ys.copy()
+    k = len(xs)
 
-    return sp.simplify(poly)
+    # Work on the nodes mapped to [-1, 1], which keeps the monomial coefficients well conditioned
+    domain = [xs.min(), xs.max()] if k > 1 else [xs[0] - 1, xs[0] + 1]
+    offset, scale = Polynomial([0, 1], domain=domain).mapparms()
+    us = offset + scale * xs
 
-def piecewise_lagrange_interpolation(points, pts_per_interval):
+    # Divided-difference table, computed in place: coefs[j] = f[u0, ..., uj]
+    for j in range(1, k):
+        coefs[j:] = (coefs[j:] - coefs[j-1:-1]) / (us[j:] - us[:-j])
+
+    poly = Polynomial([coefs[-1]], domain=domain)
+    for j in range(k - 2, -1, -1):
+        poly = poly * Polynomial([-us[j], 1], domain=domain) + coefs[j]
+
+    if to_sympy:
+        if form == 'raw':
+            u = float(offset) + float(scale) * _X
+            expr = sp.Float(coefs[-1])
+            for j in range(k - 2, -1, -1):
+                expr = expr * (u - float(us[j])) + float(coefs[j])
+            return expr
+        expr = sp.Poly(poly.convert().coef[::-1], _X).as_expr()
+        return sp.horner(expr, _X) if form == 'horner' else expr
+    return poly
+
+def barycentric_weights(xs):
+    """
+    Compute the barycentric weights w_j = 1 / prod_{m != j} (x_j - x_m) of the nodes xs.
+
+        Args:
+            xs: array of distinct x-coordinates.
+        Returns:
+            A numpy array with the weight of each node.
+    """
+    xs = np.asarray(xs, dtype=float)
+    # Each difference x_j - x_m is computed once for the whole table; adding the identity
+    # turns the zero diagonal into ones, so it doesn't affect the product
+    diffs = xs[:, None] - xs[None, :] + np.eye(len(xs))
+    return 1.0 / np.prod(diffs, axis=1)
+
+@lru_cache(maxsize=32)
+def _cached_barycentric_weights(xs):
+    """barycentric_weights for a tuple of nodes, cached so repeated plots of the same points reuse them."""
+    w = barycentric_weights(xs)
+    w.flags.writeable = False
+    return w
+
+def barycentric_eval(xs, ys, w, x):
+    """
+    Evaluate the Lagrange polynomial through (xs, ys) with the second (true) barycentric formula
+
+        p(x) = sum_j (w_j y_j / (x - x_j)) / sum_j (w_j / (x - x_j)),
+
+    which costs O(n) operations per evaluation point once the weights w are known.
+
+        Args:
+            xs, ys: arrays with the coordinates of the interpolation points.
+            w: the barycentric weights of xs (see barycentric_weights).
+            x: point or array of points where the polynomial is evaluated.
+        Returns:
+            A numpy array (or float) with the values of the polynomial at x.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    xq = np.atleast_1d(np.asarray(x, dtype=float))
+
+    diffs = xq[:, None] - xs[None, :]
+    exact = diffs == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = w / diffs
+        values = (terms @ ys) / terms.sum(axis=1)
+
+    # At the nodes themselves the formula is 0/0: use the data value instead
+    on_node = exact.any(axis=1)
+    values[on_node] = ys[exact[on_node].argmax(axis=1)]
+
+    return values if np.ndim(x) else float(values[0])
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _lagrange_eval(xs, ys, w, xq, out):
+    """
+    Evaluate the Lagrange polynomial at every xq[k] into out[k] with the first barycentric form
+    l(x) * sum_i w_i y_i / (x - x_i), where l(x) = prod_i (x - x_i) and w are the barycentric weights.
+    """
+    n = xs.shape[0]
+    for k in prange(xq.shape[0]):
+        l = 1.0
+        s = 0.0
+        hit = -1
+        for i in range(n):
+            d = xq[k] - xs[i]
+            if d == 0.0:
+                hit = i
+                break
+            l *= d
+            s += w[i] * ys[i] / d
+        out[k] = ys[hit] if hit >= 0 else l * s
+
+def make_horner_eval(coeffs):
+    """
+    Generate and compile a function that evaluates the polynomial with coefficients coeffs
+    (highest degree first, as np.polyval) with Horner's scheme.
+
+    The coefficients are written into the source as constants, one multiply-add per line,
+    so an evaluation runs straight-line code with no loop over the coefficients. The
+    function works on floats and NumPy arrays, and can be compiled with numba.njit.
+    """
+    lines = ['def horner(x):', f'    y = {float(coeffs[0])!r} + 0.0 * x']
+    lines += [f'    y = y * x + {float(c)!r}' for c in coeffs[1:]]
+    lines.append('    return y')
+    namespace = {'inf': np.inf, 'nan': np.nan}
+    exec('\n'.join(lines), namespace)
+    return namespace['horner']
+
+class PiecewiseLagrange:
+    """
+    Numeric piecewise Lagrange polynomial.
+
+    Each subinterval [breaks[i], breaks[i+1]] stores the coefficients of its interpolating
+    polynomial in the local variable t = x - breaks[i] (highest degree first, as np.polyval).
+    Evaluation picks the subinterval of every point with np.searchsorted and applies Horner's
+    scheme to all points at once. Points outside [breaks[0], breaks[-1]] use the first or last
+    polynomial.
+
+    Attributes:
+        breaks: array of shape (k+1,) with the endpoints of the k subintervals.
+        coeffs: array of shape (k, degree+1) with the local coefficients of each subinterval.
+    """
+
+    def __init__(self, breaks, coeffs):
+        self.breaks = np.asarray(breaks, dtype=float)
+        self.coeffs = np.asarray(coeffs, dtype=float)
+
+    def __call__(self, x):
+        xq = np.asarray(x, dtype=float)
+        k = len(self.coeffs)
+        idx = np.clip(np.searchsorted(self.breaks, xq) - 1, 0, k - 1)
+        t = xq - self.breaks[idx]
+        c = np.take(self.coeffs, idx, axis=0)
+
+        values = c[..., 0]
+        for j in range(1, self.coeffs.shape[1]):
+            values = values * t + c[..., j]
+        return values
+
+    def as_sympy(self):
+        """Return the polynomial as a sympy Piecewise expression in 'x'."""
+        pieces = []
+        for a, b, c in zip(self.breaks[:-1], self.breaks[1:], self.coeffs):
+            poly = sp.expand(sp.Poly(c, _X).as_expr().subs(_X, _X - a))
+            pieces.append((poly, (_X >= a) & (_X <= b)))
+        return sp.Piecewise(*pieces)
+
+def piecewise_lagrange_interpolation(points, pts_per_interval, to_sympy=False):
     """
     Perform piecewise Lagrange interpolation on subintervals defined by the given points.
 
     Args:
-        points: A list of tuples (x, y) representing the data points.
+        points: A list of tuples (x, y) or an array of shape (n, 2) with the data points.
         pts_per_interval: The number of points in each subinterval to use for interpolation.
+        to_sympy: If True, return the polynomial as a sympy Piecewise expression in 'x'.
 
     Returns:
-        A sympy expression representing the piecewise Lagrange polynomial.
+        A PiecewiseLagrange (or a sympy expression if to_sympy is True) representing the
+        piecewise Lagrange polynomial.
     """
-    x = sp.symbols('x')
-    pieces = []
-    num_points = len(points)
+    xs, ys = _as_xy(points)
+    num_points = len(xs)
+    step = pts_per_interval - 1  # overlap by 1 point
+    degree = min(pts_per_interval, num_points) - 1
+    breaks = [xs[:1]]
+    coeffs = []
     start = 0
 
-    while start < num_points - 1:
-        end = min(start + pts_per_interval, num_points)
-        sub_points = points[start:end]
-        a, b = sub_points[0][0], sub_points[-1][0]
-        poly = lagrange_interpolation(sub_points)
-        pieces.append((poly, (x >= a) & (x <= b)))
-        start += pts_per_interval - 1  # overlap by 1 point
+    if num_points >= pts_per_interval:
+        # Every full subinterval at once: zero-copy windows of the points, and one batched
+        # solve of the Vandermonde systems in the local variable t = x - x_start
+        win_x = sliding_window_view(xs, pts_per_interval)[::step]
+        win_y = sliding_window_view(ys, pts_per_interval)[::step]
+        t = win_x - win_x[:, :1]
+        vander = t[..., None] ** np.arange(degree, -1, -1)
+        coeffs.append(np.linalg.solve(vander, win_y[..., None])[..., 0])
+        breaks.append(win_x[:, -1])
+        start = len(win_x) * step
 
-    return sp.Piecewise(*pieces)
+    if start < num_points - 1:
+        sub_x, sub_y = xs[start:], ys[start:]
+        local = np.polyfit(sub_x - sub_x[0], sub_y, len(sub_x) - 1)
+        # A shorter last subinterval has a lower degree: pad with leading zeros
+        coeffs.append(np.concatenate([np.zeros(degree + 1 - len(local)), local])[None, :])
+        breaks.append(sub_x[-1:])
+
+    breaks = np.concatenate(breaks)
+    coeffs = np.concatenate(coeffs)
+
+    piecewise = PiecewiseLagrange(breaks, coeffs)
+    if to_sympy:
+        return piecewise.as_sympy()
+    return piecewise
+
+def graph_interpolation(expr, points, title, use_numba=False):
+    """
+    Plot the data points together with an interpolation curve.
+
+    expr is a sympy expression in 'x', a numeric function of a NumPy array (such as the
+    Polynomial returned by lagrange_interpolation), or None to plot the Lagrange polynomial
+    through the points evaluated numerically with the barycentric formula. A sympy polynomial
+    is evaluated from its coefficients with a function generated by make_horner_eval.
+    use_numba compiles a sympy expr with numba before evaluating it; with expr=None it
+    evaluates the Lagrange form of the points with a compiled parallel kernel instead.
+    """
+    import matplotlib.pyplot as plt  # imported here so the numeric routines don't pay for matplotlib
 
-def graph_interpolation(expr, points, title):
-    x = sp.symbols('x')
-    f = sp.lambdify(x, expr, modules=['numpy'])
-    
     # Original points
-    x_vals_points = [p[0] for p in points]
-    y_vals_points = [p[1] for p in points]
+    xs, ys = _as_xy(points)
+
+    if expr is None:
+        w = _cached_barycentric_weights(tuple(xs.tolist()))
+    if expr is None and use_numba:
+        def f(xq):
+            out = np.empty_like(xq)
+            _lagrange_eval(xs, ys, w, xq, out)
+            return out
+    elif expr is None:
+        f = lambda xq: barycentric_eval(xs, ys, w, xq)
+    elif isinstance(expr, sp.Poly) or (isinstance(expr, sp.Basic)
+                                        and expr.free_symbols <= {_X} and expr.is_polynomial(_X)):
+        # Polynomials skip lambdify: Horner's scheme is generated from their coefficients
+        f = make_horner_eval(np.array(sp.Poly(expr, _X).all_coeffs(), dtype=float))
+        if use_numba:
+            f = njit(f)
+    elif isinstance(expr, sp.Basic):
+        f = cached_lambdify(expr, use_numba)
+    else:
+        f = expr
     
     # Dense sampling for smooth polynomial curve
-    x_min, x_max = min(x_vals_points), max(x_vals_points)
+    x_min, x_max = xs.min(), xs.max()
     x_dense = np.linspace(x_min, x_max, 400)
     y_dense = f(x_dense)
 
     plt.figure(figsize=(8, 5))
-    plt.plot(x_vals_points, y_vals_points, 'ro', label='Data Points')
+    plt.plot(xs, ys, 'ro', label='Data Points')
     plt.plot(x_dense, y_dense, 'b-', label='Interpolation Polynomial')
     plt.legend()
     plt.xlabel('x')
@@ -80,12 +392,12 @@ def test_lagrange_interpolation():
     x = sp.symbols('x')
 
     # Exact polynomial (Lagrange interpolation)
-    exact_poly = lagrange_interpolation(points)
+    exact_poly = lagrange_interpolation(points, to_sympy=True)
     print(f"Exact Lagrange Polynomial: {exact_poly}")
 
     # Test piecewise interpolation
     n = 3
-    piecewise_poly = piecewise_lagrange_interpolation(points, n)
+    piecewise_poly = piecewise_lagrange_interpolation(points, n, to_sympy=True)
     print(f"\nPiecewise Lagrange Polynomial ({n} points per interval): {piecewise_poly}")
 
     # Graph the interpolation
@@ -0,0 +1,45 @@
+import sys
+from functools import update_wrapper
+
+# numba is optional and slow to import, so it is only loaded the first time a kernel runs.
+# Without it the kernels run as plain Python loops.
+
+prange = range
+
+class _LazyJit:
+    """A kernel that is compiled with numba.njit(**options) on its first call."""
+
+    def __init__(self, py_func, options):
+        update_wrapper(self, py_func)
+        self.py_func = py_func
+        self._options = options
+        self._dispatcher = None
+
+    def __call__(self, *args):
+        if self._dispatcher is None:
+            try:
+                import numba
+            except ImportError:
+                self._dispatcher = self.py_func
+            else:
+                # Compiled loops must use numba.prange; outside numba it behaves like range
+                if self.py_func.__globals__.get('prange') is prange:
+                    self.py_func.__globals__['prange'] = numba.prange
+                self._dispatcher = numba.njit(**self._options)(self.py_func)
+        return self._dispatcher(*args)
+
+def njit(*args, **options):
+    """
+    Drop-in for numba.njit that defers importing numba and compiling to the first call.
+    The undecorated function stays available as .py_func, as with numba.
+    """
+    if len(args) == 1 and callable(args[0]):
+        return _LazyJit(args[0], options)
+    return lambda func: _LazyJit(func, options)
+
+def is_jitted(f):
+    """True if f is a numba-compiled function (which requires numba to be loaded already)."""
+    if 'numba' not in sys.modules:
+        return False
+    from numba.extending import is_jitted as numba_is_jitted
+    return numba_is_jitted(f)
@@ -1,28 +1,51 @@
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
-import sympy as sp
 
+from numericalMethods.interpolation import cached_lambdify
+
+def _add_lines(ax, segments, labels):
+    """
+    Draw each (N, 2) array of points in segments as a line of a single LineCollection,
+    which matplotlib renders in one call instead of one artist per line.
+    Returns legend handles with the color and label of each line.
+    """
+    cycle = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    colors = [cycle[i % len(cycle)] for i in range(len(segments))]
+    ax.add_collection(LineCollection(segments, colors=colors))
+    ax.autoscale()
+    return [Line2D([], [], color=color, label=label) for color, label in zip(colors, labels)]
 
 def read_interpolation_points(file_path):
-    points = []
-    with open(file_path, 'r') as f:
-        for line in f:
-            x, y = map(float, line.strip().split(','))
-            points.append((x, y))
-    return points
-
-def plot_points(points):
-    x_vals, y_vals = zip(*points)
-    plt.figure(figsize=(8, 10))
-    plt.scatter(x_vals, y_vals, color='blue', marker='o')  # scatter instead of plot
-    plt.title('Puntos chocolatera')
-    plt.xlabel('X (Cm)')
-    plt.ylabel('Y (Cm)')
-    plt.grid(True)
-    plt.axis('equal')
+    """
+    Reads 'x, y' lines from file_path into a float64 array of shape (N, 2),
+    parsed by NumPy's C reader.
+    """
+    return np.loadtxt(file_path, delimiter=',', dtype=np.float64, ndmin=2)
+
+def show_all():
+    """
+    Show every open figure. The plot_* helpers only draw and return their figure, so a
+    script can build several figures (or save them) and display them all at once.
+    """
     plt.show()
 
-def plot_function_expresion(func_dict, same_plot=True):
+def plot_points(points, ax=None):
+    """Scatter plot of the interpolation points on ax (a new figure if None). Returns (fig, ax)."""
+    points = np.asarray(points, dtype=float)
+    x_vals, y_vals = points[:, 0], points[:, 1]
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(8, 10))
+    ax.scatter(x_vals, y_vals, color='blue', marker='o')  # scatter instead of plot
+    ax.set_title('Puntos chocolatera')
+    ax.set_xlabel('X (Cm)')
+    ax.set_ylabel('Y (Cm)')
+    ax.grid(True)
+    ax.axis('equal')
+    return ax.figure, ax
+
+def plot_function_expresion(func_dict, same_plot=True, use_numba=False, ax=None):
     """
     Plots functions from a dictionary of the form:
     {
@@ -31,23 +54,26 @@ def plot_function_expresion(func_dict, same_plot=True):
     }
     same_plot: If True, all functions are on the same axes;
                If False, each function has its own subplot.
+    use_numba: If True, compile each expression with numba before evaluating it.
+    ax: Axes to draw on when same_plot is True (a new figure if None).
+    Returns (fig, axes).
     """
-    x = sp.symbols('x')
-
     if same_plot:
-        plt.figure(figsize=(10, 6))
-        for name, (func, lower_bound, upper_bound) in func_dict.items():
-            f = sp.lambdify(x, func, modules=['numpy'])
-            x_vals = np.linspace(lower_bound, upper_bound, 300)
-            y_vals = f(x_vals)
-            plt.plot(x_vals, y_vals, label=name)
-
-        plt.title('Function Plot')
-        plt.xlabel('X')
-        plt.ylabel('Y')
-        plt.grid(True)
-        plt.legend()
-        plt.show()
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(10, 6))
+        segments = np.empty((len(func_dict), 300, 2))
+        for segment, (func, lower_bound, upper_bound) in zip(segments, func_dict.values()):
+            f = cached_lambdify(func, use_numba)
+            segment[:, 0] = np.linspace(lower_bound, upper_bound, 300)
+            segment[:, 1] = f(segment[:, 0])
+        handles = _add_lines(ax, segments, func_dict.keys())
+
+        ax.set_title('Function Plot')
+        ax.set_xlabel('X')
+        ax.set_ylabel('Y')
+        ax.grid(True)
+        ax.legend(handles=handles)
+        return ax.figure, ax
 
     else:
         num_funcs = len(func_dict)
@@ -57,7 +83,7 @@ def plot_function_expresion(func_dict, same_plot=True):
             axes = [axes]  # Make it iterable
 
         for ax, (name, (func, lower_bound, upper_bound)) in zip(axes, func_dict.items()):
-            f = sp.lambdify(x, func, modules=['numpy'])
+            f = cached_lambdify(func, use_numba)
             x_vals = np.linspace(lower_bound, upper_bound, 300)
             y_vals = f(x_vals)
             ax.plot(x_vals, y_vals, label=name)
@@ -67,20 +93,21 @@ def plot_function_expresion(func_dict, same_plot=True):
             ax.grid(True)
             ax.legend()
 
-        plt.tight_layout()
-        plt.show()
+        fig.tight_layout()
+        return fig, axes
 
-def plot_function(func_dict, same_plot=True):
+def plot_function(func_dict, same_plot=True, ax=None):
     if same_plot:
-        plt.figure(figsize=(10, 6))
-        for name, (t, u) in func_dict.items():
-            plt.plot(t, u, label=name)
-
-        plt.xlabel("t")
-        plt.ylabel("u(t)")
-        plt.legend()
-        plt.title("Exponential Decay: Numerical Schemes")
-        plt.show()
+        if ax is None:
+            fig, ax = plt.subplots(figsize=(10, 6))
+        segments = [np.column_stack([t, u]) for t, u in func_dict.values()]
+        handles = _add_lines(ax, segments, func_dict.keys())
+
+        ax.set_xlabel("t")
+        ax.set_ylabel("u(t)")
+        ax.legend(handles=handles)
+        ax.set_title("Exponential Decay: Numerical Schemes")
+        return ax.figure, ax
     else:
         num_funcs = len(func_dict)
         fig, axes = plt.subplots(1, num_funcs, figsize=(6 * num_funcs, 5), squeeze=False)
@@ -93,8 +120,8 @@ def plot_function(func_dict, same_plot=True):
             ax.set_title(f"Exponential Decay: {name}")
             ax.legend()
 
-        plt.tight_layout()
-        plt.show()
+        fig.tight_layout()
+        return fig, axes
 
 def plot_exponential_decay_stability(approx_list, exact_solution, T, method):
 
@@ -120,27 +147,28 @@ def plot_exponential_decay_stability(approx_list, exact_solution, T, method):
         ax.legend()
         ax.grid(True)
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    return fig, axes
 
 def plot_log_dt_log_E(dt_values, E_values, methods):
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
 
     log_dt = np.log(dt_values)
-    log_E = {method: np.log(E_values[method]) for method in methods}
+    # One row of log(E) per method, from a single np.log call
+    log_E = np.log(np.stack([E_values[method] for method in methods]))
 
     # Mask for linear zone: log(dt) < -2
     mask = log_dt < -1.5
+    log_dt_linear = log_dt[mask]
 
-    slopes = {}
-    for ax, method in zip(axes, methods):
-        x = log_dt[mask]
-        y = log_E[method][mask]
-        # Linear fit for the linear zone
-        slope = np.polyfit(x, y, 1)[0]
-        slopes[method] = slope
+    # Linear fit for the linear zone, all methods at once: one least-squares solve with
+    # a column of log(E) per method
+    A = np.column_stack([log_dt_linear, np.ones(len(log_dt_linear))])
+    coefs, _, _, _ = np.linalg.lstsq(A, log_E[:, mask].T, rcond=None)
+    slopes = coefs[0]
 
-        ax.plot(log_dt, log_E[method], label=f'{method} (slope = {slope:.2f})')
+    for ax, method, log_E_method, slope in zip(axes, methods, log_E, slopes):
+        ax.plot(log_dt, log_E_method, label=f'{method} (slope = {slope:.2f})')
         ax.set_title(f'Log-Log Plot: {method}')
         ax.set_xlabel('Log(dt)')
         ax.set_ylabel('Log(Error)')
@@ -148,7 +176,7 @@ def plot_log_dt_log_E(dt_values, E_values, methods):
         ax.legend()
 
         # Highlight the linear zone
-        ax.axvspan(log_dt[mask][0], log_dt[mask][-1], color='yellow', alpha=0.2)
+        ax.axvspan(log_dt_linear[0], log_dt_linear[-1], color='yellow', alpha=0.2)
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    return fig, axes
@@ -6,40 +6,74 @@ def boundary_conditions(p, u, A, b):
     Apply Dirichlet boundary conditions at node p with potential u.
     Modifies matrix A and vector b in place.
 
+    A can be a dense ndarray or a scipy.sparse matrix. For sparse matrices only the
+    stored entries of row p are touched, so assemble the system as a lil_matrix (or
+    csr_matrix) and convert it with A.tocsr() before solving with
+    scipy.sparse.linalg.spsolve.
+
     Parameters:
     p : int
         Index of the node where the boundary condition is applied.
     u : float
         Potential value at the boundary.
-    A : ndarray
+    A : ndarray or scipy.sparse matrix (LIL or CSR)
         Coefficient matrix.
     b : ndarray
         Right-hand side vector.
     Returns:
-    A : ndarray
+    A : ndarray or scipy.sparse matrix
         Modified coefficient matrix.
     b : ndarray
         Modified right-hand side vector.
     '''
-    A[p, :] = 0
-    A[p, p] = 1
+    fmt = getattr(A, 'format', None)
+    if fmt == 'lil':
+        A.rows[p] = [p]
+        A.data[p] = [1.0]
+    elif fmt == 'csr':
+        row = slice(A.indptr[p], A.indptr[p+1])
+        A.data[row] = 0
+        A[p, p] = 1
+    else:
+        A[p, :] = 0
+        A[p, p] = 1
     b[p] = u
 
     return A, b
 
-def plot_solution(V , n_x_nodes, n_y_nodes, X, Y):
+def show_all():
+    '''
+    Show every open figure. plot_solution only draws and returns its figure, so several
+    solutions can be drawn (or saved) first and displayed all at once.
+    '''
+    plt.show()
+
+def plot_solution(V , n_x_nodes, n_y_nodes, X, Y, max_pixels=2000, ax=None, display_precision='float64'):
     '''
-    Plot the 2D potential distribution.
+    Plot the 2D potential distribution on ax (a new figure if None). Returns (fig, ax).
+    Grids with more than max_pixels nodes along an axis are subsampled with a strided view
+    before drawing, since the figure can't show more detail than that anyway.
+    With display_precision='float32' the drawn grid is converted to single precision, which
+    halves the memory that matplotlib has to normalize and colormap (V itself is not changed).
     '''
     V_matrix = V.reshape((n_y_nodes, n_x_nodes))
 
-    max_abs = np.max(np.abs(V_matrix))
-    plt.imshow(V_matrix, extent=[0, X, 0, Y], origin='lower', aspect='auto', cmap='seismic', vmin=-max_abs, vmax=max_abs)
-    plt.colorbar(label='Potential (V)')
-    plt.xlabel('x')
-    plt.ylabel('y')
-    plt.title('2D Potential Distribution')
-    plt.show()
+    # The color limits come from the full solution, before subsampling
+    max_abs = max(-V_matrix.min(), V_matrix.max())
+
+    stride_y = -(-n_y_nodes // max_pixels)
+    stride_x = -(-n_x_nodes // max_pixels)
+    V_matrix = V_matrix[::stride_y, ::stride_x].astype(display_precision, copy=False)
+
+    if ax is None:
+        fig, ax = plt.subplots()
+    image = ax.imshow(V_matrix, extent=[0, X, 0, Y], origin='lower', aspect='auto', cmap='seismic',
+                      vmin=-max_abs, vmax=max_abs, interpolation='nearest')
+    ax.figure.colorbar(image, ax=ax, label='Potential (V)')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    ax.set_title('2D Potential Distribution')
+    return ax.figure, ax
 
 import numpy as np
 